@@ -1,17 +1,98 @@
-from django.contrib import admin
+from datetime import timedelta
+
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Count, F
+from django.utils.functional import cached_property
+
 from .models import Event, Category, RSVP
+from .recommendations import forget_rsvps
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator that reads the planner's row estimate for unfiltered changelists
+    on PostgreSQL instead of running a full COUNT(*) over the table.
+    Filtered querysets and small tables still get an exact count.
+    """
+    exact_threshold = 10000
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        query = getattr(qs, "query", None)
+        if query is None or query.where:
+            return super().count
+        connection = connections[qs.db]
+        if connection.vendor != "postgresql":
+            return super().count
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [qs.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        estimate = int(row[0]) if row else -1
+        if estimate < self.exact_threshold:
+            return super().count
+        return estimate
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("name", "description")
+    search_fields = ("name",)
+
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ("name", "date", "time", "location", "category")
+    list_display = ("name", "date", "time", "location", "category", "rsvp_count")
     list_filter = ("category", "date")
+    list_select_related = ("category",)
+    # Served by the pg_trgm indexes from migration 0004.
     search_fields = ("name", "location")
+    autocomplete_fields = ("category",)
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    actions = ("postpone_one_week",)
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        # Only the changelist shows the count; change/delete views skip the GROUP BY.
+        match = request.resolver_match
+        opts = self.model._meta
+        if match and match.url_name == f"{opts.app_label}_{opts.model_name}_changelist":
+            qs = qs.annotate(rsvp_count=Count("rsvps"))
+        return qs
+
+    @admin.display(description="RSVPs", ordering="rsvp_count")
+    def rsvp_count(self, obj):
+        return obj.rsvp_count
+
+    @admin.action(description="Postpone selected events by one week")
+    def postpone_one_week(self, request, queryset):
+        updated = queryset.update(date=F("date") + timedelta(days=7))
+        self.message_user(request, f"Postponed {updated} event(s).", messages.SUCCESS)
+
 
 @admin.register(RSVP)
 class RSVPAdmin(admin.ModelAdmin):
     list_display = ("user", "event", "created_at")
-    search_fields = ("user__username", "event__name")
\ No newline at end of file
+    list_select_related = ("user", "event")
+    search_fields = ("user__username", "event__name")
+    autocomplete_fields = ("user", "event")
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving an RSVP would leave the recommendation pair counts behind;
+        # delete it and add a new one instead.
+        if obj is not None:
+            return ("user", "event") + tuple(super().get_readonly_fields(request, obj))
+        return super().get_readonly_fields(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            forget_rsvps(queryset.values_list("user_id", "event_id"))
+            super().delete_queryset(request, queryset)
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 class EventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "events"
\ No newline at end of file
+    name = "events"
+
+    def ready(self):
+        # Import to register the RSVP receivers that maintain recommendations.
+        # events.signals (RSVP emails) is deliberately left unregistered here.
+        import events.recommendations  # noqa: F401
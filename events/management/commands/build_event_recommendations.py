@@ -0,0 +1,56 @@
+import numpy as np
+from scipy import sparse
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from events.models import EventCoOccurrence, RSVP
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the event co-occurrence table from all RSVPs. On PostgreSQL the "
+        "RSVP table is share-locked for the whole rebuild, so new RSVPs wait until "
+        "it commits; run it off-peak. Migration 0006 and the RSVP receivers keep the "
+        "table current, so this is only needed to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # SHARE blocks RSVP writes until we commit, so the edges read below
+            # match what the rebuilt table reflects; RSVPs that arrive meanwhile
+            # wait and then apply their signal increments on top of it.
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LOCK TABLE {connection.ops.quote_name(RSVP._meta.db_table)} IN SHARE MODE")
+            edges = np.array(list(RSVP.objects.values_list("user_id", "event_id")), dtype=np.int64).reshape(-1, 2)
+            stored = self.rebuild(edges, options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stored} event pairs from {len(edges)} RSVPs."
+        ))
+
+    def rebuild(self, edges, batch_size):
+        # users x events incidence matrix; A.T @ A counts shared attendees per event pair.
+        user_ids, user_idx = np.unique(edges[:, 0], return_inverse=True)
+        event_ids, event_idx = np.unique(edges[:, 1], return_inverse=True)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(edges), dtype=np.int32), (user_idx, event_idx)),
+            shape=(len(user_ids), len(event_ids)),
+        )
+        co = (incidence.T @ incidence).tocoo()
+        keep = co.row != co.col
+        rows, cols, counts = event_ids[co.row[keep]], event_ids[co.col[keep]], co.data[keep]
+
+        EventCoOccurrence.objects.all().delete()
+        EventCoOccurrence.objects.bulk_create(
+            (
+                EventCoOccurrence(event_id=int(e), other_id=int(o), count=int(c))
+                for e, o, c in zip(rows, cols, counts)
+            ),
+            batch_size=batch_size,
+        )
+        return len(counts)
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.26 on 2026-10-19 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_rsvp_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventCoOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='co_occurrences', to='events.event')),
+                ('other', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='events.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', '-count'], name='cooccur_event_count_idx')],
+                'unique_together': {('event', 'other')},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import migrations
+
+
+# Admin search runs `UPPER(col::text) LIKE UPPER('%term%')` on PostgreSQL, which
+# only a trigram index on the same expression can serve. pg_trgm ships with
+# PostgreSQL contrib; other backends, and servers without it, skip the indexes
+# and search falls back to a scan.
+TRGM_INDEXES = [
+    ("event_name_trgm_idx", "events_event", "name"),
+    ("event_location_trgm_idx", "events_event", "location"),
+    ("user_username_trgm_idx", "accounts_customuser", "username"),
+]
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRGM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRGM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0003_eventcooccurrence'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.26 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0004_admin_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rsvp',
+            name='event',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rsvps', to='events.event'),
+        ),
+        migrations.AlterField(
+            model_name='rsvp',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='rsvps', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
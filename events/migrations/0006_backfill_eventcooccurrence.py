@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    # Count RSVPs that existed before the receivers went live. One self-join at
+    # deploy time; afterwards the receivers and build_event_recommendations
+    # keep the table current.
+    RSVP = apps.get_model("events", "RSVP")
+    EventCoOccurrence = apps.get_model("events", "EventCoOccurrence")
+    quote = schema_editor.quote_name
+    rsvp = quote(RSVP._meta.db_table)
+    EventCoOccurrence.objects.all().delete()
+    schema_editor.execute(
+        f"INSERT INTO {quote(EventCoOccurrence._meta.db_table)} (event_id, other_id, count) "
+        f"SELECT a.event_id, b.event_id, COUNT(*) FROM {rsvp} a "
+        f"JOIN {rsvp} b ON a.user_id = b.user_id AND a.event_id <> b.event_id "
+        f"GROUP BY a.event_id, b.event_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_rsvp_drop_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -25,19 +25,55 @@ class Event(models.Model):
 
     class Meta:
         ordering = ["date", "time"]
+        indexes = [
+            # Default listing order, date-range filters and upcoming/past splits.
+            models.Index(fields=["date", "time"], name="event_date_time_idx"),
+            # Category filter on the event list, still ordered by (date, time).
+            models.Index(
+                fields=["category", "date", "time"],
+                name="event_category_date_time_idx",
+                condition=models.Q(category__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.date})"
 
 
 class RSVP(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="rsvps")
-    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="rsvps")
+    # Indexed through unique_together (user, event) and the composite indexes below.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="rsvps", db_index=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="rsvps", db_index=False)
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         unique_together = ("user", "event")
         ordering = ["-created_at"]
+        indexes = [
+            # A user's RSVPs, newest first (MyRSVPsView, participant dashboard).
+            models.Index(fields=["user", "-created_at"], name="rsvp_user_created_idx"),
+            # An event's attendees in RSVP order (event detail, dashboards).
+            models.Index(fields=["event", "created_at"], name="rsvp_event_created_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} -> {self.event.name}"
\ No newline at end of file
+        return f"{self.user.username} -> {self.event.name}"
+
+
+class EventCoOccurrence(models.Model):
+    """
+    Number of users who RSVP'd to both `event` and `other`. Each pair is stored
+    in both directions so recommendations for an event are one index range scan.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="co_occurrences")
+    other = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="+")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("event", "other")
+        indexes = [
+            models.Index(fields=["event", "-count"], name="cooccur_event_count_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} ~ {self.other_id} ({self.count})"
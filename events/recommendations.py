@@ -0,0 +1,193 @@
+"""
+"Attendees also joined" recommendations backed by the EventCoOccurrence table.
+
+The table is backfilled by migration 0006, rebuilt in bulk by
+`manage.py build_event_recommendations`, and kept current between rebuilds by
+the receivers at the bottom of this module. Code that deletes RSVPs with a
+queryset must call `forget_rsvps` itself first, as RSVPAdmin.delete_queryset
+does.
+"""
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Event, EventCoOccurrence, RSVP
+
+
+def _shift_pairs(deltas):
+    """
+    Apply {(event_id, other_id): delta} to the co-occurrence counts.
+
+    Every row is inserted and then locked in (event_id, other_id) order, so two
+    RSVPs touching the same pairs from opposite sides queue up instead of
+    deadlocking.
+    """
+    keys = sorted(k for k, delta in deltas.items() if delta)
+    if not keys:
+        return
+    with transaction.atomic():
+        # Create missing pairs at zero first so the increment below is a plain
+        # UPDATE and concurrent RSVPs cannot lose counts.
+        EventCoOccurrence.objects.bulk_create(
+            [EventCoOccurrence(event_id=e, other_id=o, count=0) for e, o in keys if deltas[e, o] > 0],
+            ignore_conflicts=True,
+        )
+        others_by_event = defaultdict(list)
+        for e, o in keys:
+            others_by_event[e].append(o)
+        match = reduce(or_, (Q(event_id=e, other_id__in=others) for e, others in others_by_event.items()))
+        rows = list(
+            EventCoOccurrence.objects.select_for_update()
+            .filter(match)
+            .order_by("event_id", "other_id")
+            .values_list("pk", "event_id", "other_id")
+        )
+        pks_by_delta = defaultdict(list)
+        for pk, e, o in rows:
+            pks_by_delta[deltas[e, o]].append(pk)
+        for delta, pks in pks_by_delta.items():
+            # Clamp at zero: RSVPs that predate the last rebuild were never counted.
+            # Rows left at zero are kept, since deleting them here would make a
+            # concurrent increment's SELECT ... FOR UPDATE skip the row; the next
+            # rebuild drops them and lookups ignore them.
+            EventCoOccurrence.objects.filter(pk__in=pks).update(count=Greatest(F("count") + delta, 0))
+
+
+def _pair_deltas(event_id, other_ids, delta):
+    deltas = {}
+    for o in other_ids:
+        deltas[event_id, o] = delta
+        deltas[o, event_id] = delta
+    return deltas
+
+
+def _other_event_ids(rsvp):
+    return list(
+        RSVP.objects.filter(user_id=rsvp.user_id)
+        .exclude(event_id=rsvp.event_id)
+        .values_list("event_id", flat=True)
+    )
+
+
+def _lock_users(user_ids):
+    # Serialise RSVP bookkeeping per user so two requests for the same user see
+    # each other's rows. NO KEY UPDATE because inserting an RSVP already holds
+    # KEY SHARE on the user row, which FOR UPDATE would deadlock against.
+    list(
+        get_user_model().objects.select_for_update(no_key=True)
+        .filter(pk__in=user_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def record_rsvp(rsvp):
+    """
+    Count a new RSVP against every other event the same user joined.
+
+    Call it in the transaction that inserted the RSVP (get_or_create does this),
+    so a concurrent RSVP of the same user counts the pair exactly once.
+    """
+    with transaction.atomic():
+        _lock_users([rsvp.user_id])
+        _shift_pairs(_pair_deltas(rsvp.event_id, _other_event_ids(rsvp), 1))
+
+
+def forget_rsvps(rsvps):
+    """
+    Undo `record_rsvp` for a set of (user_id, event_id) RSVPs about to be deleted
+    together. Call it in the deleting transaction, before the DELETE.
+
+    Each co-attendance pair is subtracted once. RSVPs already removed by a
+    concurrent request are skipped, so a double delete cannot subtract twice.
+    """
+    deleted_by_user = defaultdict(set)
+    for user_id, event_id in rsvps:
+        deleted_by_user[user_id].add(event_id)
+    if not deleted_by_user:
+        return
+    with transaction.atomic():
+        _lock_users(deleted_by_user)
+        current_by_user = defaultdict(set)
+        for user_id, event_id in RSVP.objects.filter(user_id__in=deleted_by_user).values_list("user_id", "event_id"):
+            current_by_user[user_id].add(event_id)
+
+        deltas = Counter()
+        for user_id, current in current_by_user.items():
+            deleted = deleted_by_user[user_id] & current
+            kept = current - deleted
+            for d in deleted:
+                for other in deleted - {d}:
+                    deltas[d, other] -= 1
+                for k in kept:
+                    deltas[d, k] -= 1
+                    deltas[k, d] -= 1
+        _shift_pairs(deltas)
+
+
+def forget_rsvp(rsvp):
+    """Undo `record_rsvp` for a single RSVP about to be deleted."""
+    forget_rsvps([(rsvp.user_id, rsvp.event_id)])
+
+
+def recommended_for_event(event, limit=5):
+    """Upcoming events most often joined by this event's attendees."""
+    pairs = (
+        EventCoOccurrence.objects.filter(event=event, count__gt=0, other__date__gte=timezone.localdate())
+        .select_related("other__category")
+        .order_by("-count")[:limit]
+    )
+    return [p.other for p in pairs]
+
+
+def recommended_for_user(user, limit=5, recent=10, per_event=20):
+    """
+    Upcoming events co-attended with the user's RSVPs that they have not joined yet.
+
+    Scores come from the user's `recent` newest RSVPs and the top `per_event`
+    pairs of each, so the work is a fixed number of short index range scans no
+    matter how many RSVPs the user or their events have.
+    """
+    today = timezone.localdate()
+    recent_ids = RSVP.objects.filter(user=user).order_by("-created_at").values_list("event_id", flat=True)[:recent]
+    scores = Counter()
+    for event_id in recent_ids:
+        top = (
+            EventCoOccurrence.objects.filter(event_id=event_id, count__gt=0, other__date__gte=today)
+            .order_by("-count")
+            .values_list("other_id", "count")[:per_event]
+        )
+        for other_id, count in top:
+            scores[other_id] += count
+    joined = set(RSVP.objects.filter(user=user, event_id__in=scores).values_list("event_id", flat=True))
+    best = [event_id for event_id, _ in scores.most_common() if event_id not in joined][:limit]
+    events = Event.objects.select_related("category").in_bulk(best)
+    return [events[event_id] for event_id in best if event_id in events]
+
+
+@receiver(post_save, sender=RSVP)
+def update_on_rsvp(sender, instance, created, **kwargs):
+    if created:
+        record_rsvp(instance)
+
+
+@receiver(pre_delete, sender=RSVP)
+def update_on_rsvp_delete(sender, instance, origin=None, **kwargs):
+    # Only for rsvp.delete(); queryset deletes call forget_rsvps() themselves,
+    # and pairs of a deleted event cascade away with it.
+    if origin is instance:
+        forget_rsvp(instance)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def update_on_user_delete(sender, instance, **kwargs):
+    forget_rsvps(RSVP.objects.filter(user=instance).values_list("user_id", "event_id"))
@@ -1,3 +1,407 @@
-from django.test import TestCase
+import json
+import unittest
+from datetime import date, time, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .admin import ApproximateCountPaginator
+from .models import Category, Event, EventCoOccurrence, RSVP
+from .recommendations import recommended_for_event, recommended_for_user
+from . import views
+
+
+class ExplainMixin:
+    """EXPLAIN helpers for the PostgreSQL plan tests; `qs` is a queryset or raw SQL."""
+    large_tables = ("events_event", "events_rsvp")
+
+    def plan_nodes(self, qs):
+        if isinstance(qs, str):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {qs}")
+                plan = cursor.fetchone()[0]
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+        else:
+            plan = json.loads(qs.explain(format="json"))
+        stack = [plan[0]["Plan"]]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.get("Plans", []))
+
+    def plan_text(self, qs):
+        if isinstance(qs, str):
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {qs}")
+                return "\n".join(row[0] for row in cursor.fetchall())
+        return qs.explain()
+
+    def assertPlanUsesIndex(self, qs, index_name):
+        plan_text = self.plan_text(qs)
+        nodes = list(self.plan_nodes(qs))
+        for node in nodes:
+            if node["Node Type"] == "Seq Scan":
+                self.assertNotIn(node["Relation Name"], self.large_tables, f"sequential scan:\n{plan_text}")
+            self.assertNotIn(node["Node Type"], ("Sort", "Incremental Sort"), f"sort:\n{plan_text}")
+        ordered_scans = {
+            node["Index Name"] for node in nodes if node["Node Type"] in ("Index Scan", "Index Only Scan")
+        }
+        self.assertIn(index_name, ordered_scans, f"expected an ordered scan of {index_name}:\n{plan_text}")
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN plan checks need PostgreSQL")
+class QueryPlanTests(ExplainMixin, TestCase):
+    """
+    Capture EXPLAIN for each view's main query on seeded, skewed data and fail
+    unless the planner reads it in order from the index meant for it, without a
+    sequential scan of a large table or an explicit sort.
+    """
+    heavy_rsvps = 2500
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        categories = Category.objects.bulk_create(Category(name=f"Category {i}") for i in range(20))
+        start = date(2025, 1, 1)
+        events = Event.objects.bulk_create(
+            Event(
+                name=f"Event {i}",
+                date=start + timedelta(days=i % 730),
+                time=time(hour=i % 24),
+                location=f"Hall {i % 50}",
+                category=categories[i % len(categories)] if i % 10 else None,
+            )
+            for i in range(5000)
+        )
+        users = User.objects.bulk_create(User(username=f"user{i}", email=f"user{i}@example.com") for i in range(3000))
+        now = timezone.now()
+
+        def rsvp(user, event, n):
+            # Scatter created_at so physical order does not match either index.
+            return RSVP(user=user, event=event, created_at=now - timedelta(minutes=(n * 7919) % 100003))
+
+        # Most users have a couple of RSVPs; users[0] and events[0] are heavy.
+        background = [
+            rsvp(user, events[1 + (u * 37 + k * 101) % (len(events) - 1)], u * 2 + k)
+            for u, user in enumerate(users[1:], start=1)
+            for k in range(2)
+        ]
+        heavy_user = [rsvp(users[0], event, n) for n, event in enumerate(events[1:cls.heavy_rsvps + 1])]
+        heavy_event = [rsvp(user, events[0], n) for n, user in enumerate(users[1:cls.heavy_rsvps + 1])]
+        RSVP.objects.bulk_create(background + heavy_user + heavy_event)
+
+        with connection.cursor() as cursor:
+            for table in cls.large_tables + ("events_category",):
+                cursor.execute(f"ANALYZE {table}")
+        cls.user = users[0]
+        cls.event = events[0]
+        cls.category = categories[3]
+
+    def view_queryset(self, view_class, path="/", **kwargs):
+        request = RequestFactory().get(path, kwargs.pop("params", {}))
+        request.user = self.user
+        view = view_class()
+        view.setup(request, **kwargs)
+        return view.get_queryset()
+
+    def test_event_list_first_page(self):
+        qs = self.view_queryset(views.EventListView)
+        self.assertPlanUsesIndex(qs[:20], "event_date_time_idx")
+        # The list template shows no attendees, so the page must not load RSVPs.
+        with CaptureQueriesContext(connection) as ctx:
+            list(qs[:20])
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if "events_rsvp" in q["sql"]])
+
+    def test_event_list_category_filter(self):
+        qs = self.view_queryset(views.EventListView, params={"category": self.category.pk})
+        self.assertPlanUsesIndex(qs[:20], "event_category_date_time_idx")
+
+    def test_event_list_date_range(self):
+        qs = self.view_queryset(views.EventListView, params={"start_date": "2025-03-01", "end_date": "2025-03-07"})
+        self.assertPlanUsesIndex(qs[:20], "event_date_time_idx")
+
+    def test_event_detail_attendees(self):
+        view = views.EventDetailView()
+        view.setup(RequestFactory().get("/"), pk=self.event.pk)
+        view.object = view.get_object()
+        attendees = view.get_context_data()["attendees"]
+        self.assertEqual(self.event.rsvps.count(), self.heavy_rsvps)
+        self.assertPlanUsesIndex(attendees, "rsvp_event_created_idx")
+
+    def test_my_rsvps(self):
+        qs = self.view_queryset(views.MyRSVPsView)
+        self.assertEqual(qs.count(), self.heavy_rsvps)
+        self.assertPlanUsesIndex(qs[:views.MyRSVPsView.paginate_by], "rsvp_user_created_idx")
+
+    def test_admin_dashboard_events(self):
+        events = admin_dashboard_context()["events"]
+        self.assertPlanUsesIndex(events, "event_date_time_idx")
+        self.assertIn("rsvp_event_created_idx", {n.get("Index Name") for n in self.plan_nodes(events)})
+
+
+def admin_dashboard_context():
+    view = views.AdminDashboardView()
+    view.setup(RequestFactory().get("/"))
+    return view.get_context_data()
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN plan checks need PostgreSQL")
+class DashboardCountPlanTests(ExplainMixin, TransactionTestCase):
+    """
+    The upcoming/past split counts most of the table, which only an index-only
+    scan beats a sequential scan at. That needs the visibility map autovacuum
+    maintains in production, so these tests commit their rows and VACUUM.
+    """
+
+    def setUp(self):
+        today = timezone.localdate()
+        # Years of past events and a short run of upcoming ones, with realistic row widths.
+        Event.objects.bulk_create(
+            Event(
+                name=f"Event {i}",
+                description="x" * 300,
+                date=today - timedelta(days=3000 - i * 3100 // 5000),
+                time=time(hour=i % 24),
+                location=f"Hall {i % 50}",
+            )
+            for i in range(5000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM ANALYZE events_event")
+
+    def test_upcoming_and_past_counts(self):
+        with CaptureQueriesContext(connection) as ctx:
+            admin_dashboard_context()
+        date_counts = [
+            q["sql"] for q in ctx.captured_queries
+            if "COUNT(" in q["sql"] and '"events_event"."date"' in q["sql"]
+        ]
+        self.assertEqual(len(date_counts), 2)
+        for sql in date_counts:
+            self.assertPlanUsesIndex(sql, "event_date_time_idx")
+
+
+class AdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.events = Event.objects.bulk_create(
+            Event(name=f"Event {i}", date=date(2026, 1, 1 + i), time=time(18), location="Hall") for i in range(3)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def test_event_changelist_shows_rsvp_count(self):
+        RSVP.objects.bulk_create([RSVP(user=self.admin_user, event=self.events[0])])
+        response = self.client.get(reverse("admin:events_event_changelist"))
+        counts = {e.pk: e.rsvp_count for e in response.context["cl"].result_list}
+        self.assertEqual(counts, {self.events[0].pk: 1, self.events[1].pk: 0, self.events[2].pk: 0})
+
+    def test_event_change_view_is_not_annotated(self):
+        response = self.client.get(reverse("admin:events_event_change", args=[self.events[0].pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.context["original"], "rsvp_count"))
+
+    def test_postpone_one_week_action(self):
+        self.client.post(reverse("admin:events_event_changelist"), {
+            "action": "postpone_one_week",
+            "_selected_action": [self.events[0].pk, self.events[1].pk],
+        })
+        self.assertEqual(
+            list(Event.objects.values_list("date", flat=True)),
+            [date(2026, 1, 3), date(2026, 1, 8), date(2026, 1, 9)],
+        )
+
+    def test_rsvp_delete_selected_keeps_confirmation_and_log(self):
+        rsvps = RSVP.objects.bulk_create(RSVP(user=self.admin_user, event=e) for e in self.events)
+        url = reverse("admin:events_rsvp_changelist")
+        data = {"action": "delete_selected", "_selected_action": [r.pk for r in rsvps[:2]]}
+        response = self.client.post(url, data)
+        self.assertTemplateUsed(response, "admin/delete_selected_confirmation.html")
+        self.client.post(url, {**data, "post": "yes"})
+        self.assertEqual(list(RSVP.objects.all()), [rsvps[2]])
+        self.assertEqual(LogEntry.objects.count(), 2)
+
+
+class ApproximateCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Event.objects.bulk_create(
+            Event(name=f"Event {i}", date=date(2026, 1, 1), time=time(18), location="Hall") for i in range(30)
+        )
+
+    def test_small_tables_are_counted_exactly(self):
+        self.assertEqual(ApproximateCountPaginator(Event.objects.all(), 10).count, 30)
+
+    def test_filtered_querysets_are_counted_exactly(self):
+        paginator = ApproximateCountPaginator(Event.objects.filter(name="Event 1"), 10)
+        paginator.exact_threshold = 0
+        self.assertEqual(paginator.count, 1)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "row estimates come from pg_class")
+    def test_large_unfiltered_tables_use_planner_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE events_event")
+            cursor.execute("SELECT reltuples FROM pg_class WHERE relname = 'events_event'")
+            estimate = int(cursor.fetchone()[0])
+        paginator = ApproximateCountPaginator(Event.objects.all(), 10)
+        paginator.exact_threshold = 0
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, estimate)
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        today = timezone.localdate()
+        cls.a, cls.b, cls.c = (
+            Event.objects.create(name=name, date=today + timedelta(days=7), time=time(18), location="Hall")
+            for name in ("A", "B", "C")
+        )
+        cls.alice = User.objects.create(username="alice")
+        cls.bob = User.objects.create(username="bob")
+
+    def test_rsvp_signals_update_pair_counts(self):
+        RSVP.objects.create(user=self.alice, event=self.a)
+        RSVP.objects.create(user=self.alice, event=self.b)
+        RSVP.objects.create(user=self.bob, event=self.a)
+        bob_b = RSVP.objects.create(user=self.bob, event=self.b)
+        pair = EventCoOccurrence.objects.get(event=self.a, other=self.b)
+        self.assertEqual(pair.count, 2)
+        self.assertEqual(EventCoOccurrence.objects.get(event=self.b, other=self.a).count, 2)
+
+        bob_b.delete()
+        pair.refresh_from_db()
+        self.assertEqual(pair.count, 1)
+
+    def pair_counts(self):
+        pairs = EventCoOccurrence.objects.filter(count__gt=0).values_list("event_id", "other_id", "count")
+        return {(e, o): c for e, o, c in pairs}
+
+    def test_deleting_user_subtracts_each_pair_once(self):
+        for user in (self.alice, self.bob):
+            for event in (self.a, self.b, self.c):
+                RSVP.objects.create(user=user, event=event)
+        self.alice.delete()
+        self.assertEqual(set(self.pair_counts().values()), {1})
+        self.assertEqual(len(self.pair_counts()), 6)
+
+    def test_admin_bulk_delete_subtracts_each_pair_once(self):
+        for event in (self.a, self.b, self.c):
+            RSVP.objects.create(user=self.bob, event=event)
+        RSVP.objects.create(user=self.alice, event=self.a)
+        RSVP.objects.create(user=self.alice, event=self.b)
+        admin_user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        selected = RSVP.objects.filter(user=self.bob, event__in=[self.a, self.b])
+        self.client.post(reverse("admin:events_rsvp_changelist"), {
+            "action": "delete_selected",
+            "_selected_action": list(selected.values_list("pk", flat=True)),
+            "post": "yes",
+        })
+        self.assertEqual(self.pair_counts(), {(self.a.pk, self.b.pk): 1, (self.b.pk, self.a.pk): 1})
+
+    def test_deleting_rsvps_that_were_never_counted(self):
+        # bob's RSVPs skip the signals, as rows created before a rebuild would.
+        RSVP.objects.create(user=self.alice, event=self.a)
+        RSVP.objects.create(user=self.alice, event=self.b)
+        RSVP.objects.bulk_create([RSVP(user=self.bob, event=self.a), RSVP(user=self.bob, event=self.b)])
+        self.assertEqual(self.pair_counts()[self.a.pk, self.b.pk], 1)
+
+        admin_user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        response = self.client.post(reverse("admin:events_rsvp_changelist"), {
+            "action": "delete_selected",
+            "_selected_action": list(RSVP.objects.values_list("pk", flat=True)),
+            "post": "yes",
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.pair_counts(), {})
+
+    def test_deleting_user_with_uncounted_rsvps(self):
+        RSVP.objects.create(user=self.alice, event=self.a)
+        RSVP.objects.create(user=self.alice, event=self.b)
+        RSVP.objects.bulk_create([RSVP(user=self.bob, event=self.a), RSVP(user=self.bob, event=self.b)])
+        self.alice.delete()
+        self.bob.delete()
+        self.assertEqual(self.pair_counts(), {})
+
+    def test_admin_cannot_move_rsvp(self):
+        RSVP.objects.create(user=self.alice, event=self.a)
+        rsvp_b = RSVP.objects.create(user=self.alice, event=self.b)
+        admin_user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        self.client.post(reverse("admin:events_rsvp_change", args=[rsvp_b.pk]), {
+            "user": self.bob.pk,
+            "event": self.c.pk,
+            "created_at_0": "2026-01-01",
+            "created_at_1": "12:00:00",
+        })
+        rsvp_b.refresh_from_db()
+        self.assertEqual((rsvp_b.user_id, rsvp_b.event_id), (self.alice.pk, self.b.pk))
+        self.assertEqual(self.pair_counts(), {(self.a.pk, self.b.pk): 1, (self.b.pk, self.a.pk): 1})
+
+    def test_user_recommendations_do_bounded_work(self):
+        today = timezone.localdate()
+        events = Event.objects.bulk_create(
+            Event(name=f"E{i}", date=today + timedelta(days=i), time=time(18), location="Hall") for i in range(15)
+        )
+        for event in events:
+            RSVP.objects.create(user=self.alice, event=event)
+            RSVP.objects.create(user=self.bob, event=event)
+        RSVP.objects.create(user=self.bob, event=self.a)
+        # Newest 10 RSVPs, one top-N lookup for each, the joined check, and the event fetch.
+        with self.assertNumQueries(13):
+            self.assertEqual(recommended_for_user(self.alice), [self.a])
+
+    def test_deleting_same_rsvp_twice_subtracts_once(self):
+        for user in (self.alice, self.bob):
+            RSVP.objects.create(user=user, event=self.a)
+            RSVP.objects.create(user=user, event=self.b)
+        # Two requests holding the same RSVP, as with a double-submitted delete.
+        first = RSVP.objects.get(user=self.bob, event=self.b)
+        second = RSVP.objects.get(pk=first.pk)
+        first.delete()
+        second.delete()
+        self.assertEqual(self.pair_counts(), {(self.a.pk, self.b.pk): 1, (self.b.pk, self.a.pk): 1})
+
+    def test_rsvp_sends_no_email(self):
+        RSVP.objects.create(user=self.alice, event=self.a)
+        self.assertEqual(mail.outbox, [])
+
+    def test_recommendations_exclude_joined_events(self):
+        RSVP.objects.create(user=self.alice, event=self.a)
+        RSVP.objects.create(user=self.alice, event=self.b)
+        RSVP.objects.create(user=self.alice, event=self.c)
+        RSVP.objects.create(user=self.bob, event=self.a)
+        self.assertCountEqual(recommended_for_event(self.a), [self.b, self.c])
+        self.assertCountEqual(recommended_for_user(self.bob), [self.b, self.c])
+        self.assertEqual(recommended_for_user(self.alice), [])
+
+    def test_build_command_matches_signal_maintained_counts(self):
+        carol = get_user_model().objects.create(username="carol")
+        for user, events in ((self.alice, (self.a, self.b, self.c)), (self.bob, (self.a, self.b)), (carol, (self.b, self.c))):
+            for event in events:
+                RSVP.objects.create(user=user, event=event)
+        RSVP.objects.get(user=self.bob, event=self.a).delete()
+        from_signals = self.pair_counts()
+
+        EventCoOccurrence.objects.update(count=99)
+        call_command("build_event_recommendations", stdout=StringIO())
+        self.assertEqual(self.pair_counts(), from_signals)
+        self.assertEqual(from_signals[self.b.pk, self.c.pk], 2)
+
+    def test_build_command_with_no_rsvps(self):
+        EventCoOccurrence.objects.create(event=self.a, other=self.b, count=3)
+        call_command("build_event_recommendations", stdout=StringIO())
+        self.assertFalse(EventCoOccurrence.objects.exists())
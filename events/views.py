@@ -3,11 +3,13 @@ from django.views import generic
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
-from django.db.models import Count, Q
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from .models import Event, Category, RSVP
 from .forms import EventForm
+from .recommendations import recommended_for_event, recommended_for_user
 
 # Role check mixin
 class GroupRequiredMixin(UserPassesTestMixin):
@@ -30,7 +32,7 @@ class EventListView(generic.ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        qs = Event.objects.select_related("category").prefetch_related("rsvps__user")
+        qs = Event.objects.select_related("category")
         q = self.request.GET.get("q", "").strip()
         category = self.request.GET.get("category", "")
         start_date = self.request.GET.get("start_date", "")
@@ -47,7 +49,7 @@ class EventListView(generic.ListView):
         if end_date:
             qs = qs.filter(date__lte=end_date)
 
-        return qs.annotate(participant_count=Count("attendees", distinct=True))
+        return qs
 
     def get_context_data(self, **kwargs):
         """
@@ -68,8 +70,19 @@ class EventDetailView(generic.DetailView):
     template_name = "events/event_detail.html"
     context_object_name = "event"
 
+    attendee_limit = 50
+
     def get_queryset(self):
-        return Event.objects.select_related("category").prefetch_related("rsvps__user")
+        return Event.objects.select_related("category")
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        # Newest attendees only; popular events can have thousands of RSVPs.
+        ctx["attendees"] = self.object.rsvps.select_related("user")[:self.attendee_limit]
+        ctx["attendee_count"] = self.object.rsvps.count()
+        ctx["more_attendees"] = max(ctx["attendee_count"] - self.attendee_limit, 0)
+        ctx["recommended_events"] = recommended_for_event(self.object)
+        return ctx
 
 class EventCreateView(LoginRequiredMixin, GroupRequiredMixin, generic.CreateView):
     group_names = ["Organizer", "Admin"]
@@ -142,6 +155,7 @@ class RSVPView(View):
 class MyRSVPsView(LoginRequiredMixin, generic.ListView):
     template_name = "events/rsvp_events.html"
     context_object_name = "rsvps"
+    paginate_by = 20
 
     def get_queryset(self):
         return self.request.user.rsvps.select_related("event__category").all()
@@ -158,7 +172,18 @@ class AdminDashboardView(LoginRequiredMixin, GroupRequiredMixin, generic.Templat
         ctx["total_events"] = Event.objects.count()
         ctx["upcoming"] = Event.objects.filter(date__gte=today).count()
         ctx["past"] = Event.objects.filter(date__lt=today).count()
-        ctx["events"] = Event.objects.select_related("category").prefetch_related("rsvps__user").all()[:50]
+        # Correlated count per row so the page reads in order from the (date, time)
+        # index; prefetching rsvps to count them loads every attendee row.
+        rsvp_counts = (
+            RSVP.objects.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(c=Count("pk"))
+            .values("c")
+        )
+        ctx["events"] = Event.objects.select_related("category").annotate(
+            rsvp_count=Coalesce(Subquery(rsvp_counts, output_field=IntegerField()), 0)
+        )[:50]
         return ctx
 
 class OrganizerDashboardView(LoginRequiredMixin, GroupRequiredMixin, generic.TemplateView):
@@ -178,4 +203,5 @@ class ParticipantDashboardView(LoginRequiredMixin, GroupRequiredMixin, generic.T
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx["rsvps"] = self.request.user.rsvps.select_related("event__category").all()
+        ctx["recommended_events"] = recommended_for_user(self.request.user)
         return ctx
\ No newline at end of file